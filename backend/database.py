@@ -1,14 +1,38 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import event, Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import relationship
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from datetime import datetime
-
-DATABASE_URL = "sqlite:///./sql_app.db" # Changed to sql_app.db for a more descriptive name
-
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False} # Needed for SQLite
+import os
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///./sql_app.db") # Changed to sql_app.db for a more descriptive name
+
+# Keep a pool of long-lived connections so requests reuse them (and SQLite's
+# page cache) instead of reconnecting on every checkout.
+engine = create_async_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False}, # Needed for SQLite
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=os.cpu_count() or 1,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    query_cache_size=1200,
 )
 
+# Tune SQLite on every new connection: WAL lets readers run alongside a writer
+# and synchronous=NORMAL drops the fsync per commit. The pool keeps these
+# connections alive, so this runs once per connection rather than per request.
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 Base = declarative_base()
 
 class Hospital(Base):
@@ -28,7 +52,7 @@ class Role(Base):
     id = Column(Integer, primary_key=True, index=True)
     role_name = Column(String, index=True)
     permissions = Column(String) # e.g., "read,write,delete"
-    hospital_id = Column(Integer, ForeignKey("hospitals.id"), nullable=True)
+    hospital_id = Column(Integer, ForeignKey("hospitals.id"), nullable=True, index=True)
 
     hospital = relationship("Hospital", back_populates="roles")
     users = relationship("User", back_populates="role")
@@ -41,7 +65,7 @@ class User(Base):
     full_name = Column(String)
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
-    role_id = Column(Integer, ForeignKey("roles.id"), nullable=True)
+    role_id = Column(Integer, ForeignKey("roles.id"), nullable=True, index=True)
 
     role = relationship("Role", back_populates="users")
     doctor_profile = relationship("Doctor", back_populates="user", uselist=False) # One-to-one
@@ -51,7 +75,7 @@ class Doctor(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True)
-    hospital_id = Column(Integer, ForeignKey("hospitals.id"))
+    hospital_id = Column(Integer, ForeignKey("hospitals.id"), index=True)
     specialty = Column(String)
     short_bio = Column(Text, nullable=True)
 
@@ -67,6 +91,15 @@ class Doctor(Base):
 #     name = Column(String, index=True)
 #     description = Column(String, nullable=True)
 
-Base.metadata.create_all(bind=engine)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Tables are created by the application's startup hook (via run_sync), since the
+# async engine cannot be used at import time.
+def init_db(connection):
+    Base.metadata.create_all(connection)
+    # create_all skips tables that already exist, so add any newer indexes too
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    # Refresh planner statistics so the new indexes get used
+    connection.exec_driver_sql("ANALYZE")
+
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
@@ -1,16 +1,46 @@
-from fastapi import FastAPI, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from database import SessionLocal, engine, Base, Hospital, Role, User, Doctor
+from fastapi import FastAPI, Depends, HTTPException, Response, status
+from sqlalchemy import select, insert, update, or_, exists, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from database import AsyncSessionLocal, engine, init_db, Hospital, Role, User, Doctor
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from passlib.context import CryptContext
 from fastapi.middleware.cors import CORSMiddleware
+from async_lru import alru_cache
 from datetime import datetime
+import asyncio
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+# Hashing is CPU-bound, so it runs in a process pool (started by the lifespan
+# handler) to keep the event loop and the GIL free for other requests
+executor = None
+_tables_created = False
+
+@asynccontextmanager
+async def lifespan(app):
+    global executor, _tables_created
+    # Create all tables in the database, once per process even when the app
+    # is started repeatedly (e.g. by test clients)
+    if not _tables_created:
+        async with engine.begin() as conn:
+            await conn.run_sync(init_db)
+        _tables_created = True
+    # The aiosqlite connection opened above runs a worker thread, so forking
+    # would copy a multi-threaded process; spawn fresh workers instead (this is
+    # also the only start method available on every platform)
+    executor = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+    try:
+        yield
+    finally:
+        executor.shutdown()
+        executor = None
+        await engine.dispose()
 
-# Create all tables in the database
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS middleware to allow requests from the frontend
 origins = [
@@ -24,18 +54,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context: Argon2id with the OWASP-recommended parameters
+# (46 MiB, t=1, p=1). bcrypt stays listed so existing hashes still verify and
+# are flagged by pwd_context.needs_update for rehashing.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=47104,
+    argon2__time_cost=1,
+    argon2__parallelism=1,
+)
 
 # Dependency to get the database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def get_db():
+    async with AsyncSessionLocal() as session:
+        yield session
 
 # Pydantic models for request and response
 class HospitalBase(BaseModel):
@@ -48,8 +85,7 @@ class HospitalCreate(HospitalBase):
 class HospitalResponse(HospitalBase):
     id: int
     created_at: datetime
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class RoleBase(BaseModel):
     role_name: str
@@ -62,8 +98,7 @@ class RoleCreate(RoleBase):
 class RoleResponse(RoleBase):
     id: int
     hospital_name: Optional[str] = None
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class UserBase(BaseModel):
     username: str
@@ -77,8 +112,7 @@ class UserCreate(UserBase):
 class UserResponse(UserBase):
     id: int
     role_name: Optional[str] = None
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DoctorBase(BaseModel):
     user_id: int
@@ -94,291 +128,442 @@ class DoctorResponse(DoctorBase):
     username: Optional[str] = None
     full_name: Optional[str] = None
     hospital_name: Optional[str] = None
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Helper function to hash passwords
-def get_password_hash(password):
+def _hash_password(password):
     return pwd_context.hash(password)
 
+async def get_password_hash(password):
+    if executor is None:
+        raise RuntimeError("Password hashing pool is not running; start the app through its lifespan")
+    return await asyncio.get_running_loop().run_in_executor(executor, _hash_password, password)
+
+# Hot statements are built once at import so SQLAlchemy's compiled cache is hit
+# directly instead of reconstructing the select on every request
+_GET_HOSPITAL_BY_ID = select(Hospital).where(Hospital.id == bindparam("id"))
+_GET_HOSPITAL_NAME = select(Hospital.name).where(Hospital.id == bindparam("id"))
+_HOSPITAL_NAME_EXISTS = select(Hospital.id).where(Hospital.name == bindparam("name")).limit(1)
+_GET_ROLE_BY_ID = select(Role).where(Role.id == bindparam("id"))
+_GET_ROLE_WITH_HOSPITAL = select(Role).options(joinedload(Role.hospital)).where(Role.id == bindparam("id"))
+_GET_USER_BY_ID = select(User).where(User.id == bindparam("id"))
+_GET_USER_WITH_ROLE = select(User).options(joinedload(User.role)).where(User.id == bindparam("id"))
+_GET_DOCTOR_BY_ID = select(Doctor).where(Doctor.id == bindparam("id"))
+_GET_DOCTOR_WITH_RELATIONS = select(Doctor).options(joinedload(Doctor.user), joinedload(Doctor.hospital)).where(Doctor.id == bindparam("id"))
+
+# List endpoints select plain columns (joined with the related names) and skip
+# ORM hydration entirely
+_HOSPITAL_ROWS = select(Hospital.id, Hospital.name, Hospital.address, Hospital.created_at)
+_ROLE_ROWS = select(
+    Role.id, Role.role_name, Role.permissions, Role.hospital_id, Hospital.name.label("hospital_name")
+).outerjoin(Role.hospital)
+_USER_ROWS = select(
+    User.id, User.username, User.full_name, User.email, User.role_id, Role.role_name
+).outerjoin(User.role)
+_DOCTOR_ROWS = select(
+    Doctor.id, Doctor.user_id, Doctor.hospital_id, Doctor.specialty, Doctor.short_bio,
+    User.username, User.full_name, Hospital.name.label("hospital_name"),
+).outerjoin(Doctor.user).outerjoin(Doctor.hospital)
+
+# Keyset pagination: fetch the page after the given id in id order, so deep
+# pages are an index range scan instead of scanning and discarding OFFSET
+# rows. The last id is returned in X-Next-Cursor when there may be more.
+async def _fetch_page(db, stmt, id_column, after, limit, response):
+    stmt = stmt.order_by(id_column).limit(limit)
+    if after is not None:
+        stmt = stmt.where(id_column > after)
+    rows = (await db.execute(stmt)).mappings().all()
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return rows
+
+# Helper to test for a matching row without loading or hydrating it
+async def _exists(db, stmt, params):
+    return (await db.execute(stmt, params)).first() is not None
+
 # --- Hospital Endpoints ---
 @app.post("/hospitals/", response_model=HospitalResponse, status_code=status.HTTP_201_CREATED)
-async def create_hospital(hospital: HospitalCreate, db: Session = Depends(get_db)):
-    db_hospital = db.query(Hospital).filter(Hospital.name == hospital.name).first()
-    if db_hospital:
+async def create_hospital(hospital: HospitalCreate, db: AsyncSession = Depends(get_db)):
+    if await _exists(db, _HOSPITAL_NAME_EXISTS, {"name": hospital.name}):
         raise HTTPException(status_code=400, detail="Hospital with this name already exists")
-    db_hospital = Hospital(**hospital.dict())
-    db.add(db_hospital)
-    db.commit()
-    db.refresh(db_hospital)
+    db_hospital = (await db.execute(
+        insert(Hospital).values(**hospital.model_dump()).returning(Hospital)
+    )).scalar_one()
+    await db.commit()
     return db_hospital
 
 @app.get("/hospitals/", response_model=List[HospitalResponse])
-async def read_hospitals(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    hospitals = db.query(Hospital).offset(skip).limit(limit).all()
-    return hospitals
-
-@app.get("/hospitals/{hospital_id}", response_model=HospitalResponse)
-async def read_hospital(hospital_id: int, db: Session = Depends(get_db)):
-    hospital = db.query(Hospital).filter(Hospital.id == hospital_id).first()
+async def read_hospitals(response: Response, after: Optional[int] = None, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    rows = await _fetch_page(db, _HOSPITAL_ROWS, Hospital.id, after, limit, response)
+    # Values come straight from the database, so validation can be skipped
+    return [HospitalResponse.model_construct(**row) for row in rows]
+
+# Point reads are cached per process and invalidated by the update/delete
+# handlers. The short TTL bounds staleness when running multiple workers.
+# Not-found raises, so misses are never cached. Invalidation is not atomic with
+# the commit: a read that started before it can finish after cache_invalidate
+# and put the old row back, which then stays stale for up to the TTL.
+@alru_cache(maxsize=1024, ttl=5)
+async def _get_hospital_cached(hospital_id: int):
+    async with AsyncSessionLocal() as db:
+        hospital = (await db.execute(_GET_HOSPITAL_BY_ID, {"id": hospital_id})).scalar_one_or_none()
     if hospital is None:
         raise HTTPException(status_code=404, detail="Hospital not found")
-    return hospital
+    return HospitalResponse.model_validate(hospital)
+
+@app.get("/hospitals/{hospital_id}", response_model=HospitalResponse)
+async def read_hospital(hospital_id: int):
+    return await _get_hospital_cached(hospital_id)
 
 @app.put("/hospitals/{hospital_id}", response_model=HospitalResponse)
-async def update_hospital(hospital_id: int, hospital: HospitalCreate, db: Session = Depends(get_db)):
-    db_hospital = db.query(Hospital).filter(Hospital.id == hospital_id).first()
-    if db_hospital is None:
+async def update_hospital(hospital_id: int, hospital: HospitalCreate, db: AsyncSession = Depends(get_db)):
+    # Check the hospital exists and the name isn't taken by another one
+    hospital_found, name_taken = (await db.execute(select(
+        exists().where(Hospital.id == hospital_id),
+        exists().where(Hospital.name == hospital.name, Hospital.id != hospital_id),
+    ))).one()
+    if not hospital_found:
         raise HTTPException(status_code=404, detail="Hospital not found")
-    
-    # Check for duplicate name if name is being changed
-    if hospital.name != db_hospital.name:
-        existing_hospital = db.query(Hospital).filter(Hospital.name == hospital.name).first()
-        if existing_hospital:
-            raise HTTPException(status_code=400, detail="Hospital with this name already exists")
-
-    for key, value in hospital.dict().items():
-        setattr(db_hospital, key, value)
-    db.commit()
-    db.refresh(db_hospital)
+    if name_taken:
+        raise HTTPException(status_code=400, detail="Hospital with this name already exists")
+
+    db_hospital = (await db.execute(
+        update(Hospital).where(Hospital.id == hospital_id).values(**hospital.model_dump()).returning(Hospital)
+    )).scalar_one()
+    await db.commit()
+    _get_hospital_cached.cache_invalidate(hospital_id)
+    # Roles and doctors embed the hospital name
+    _get_role_cached.cache_clear()
+    _get_doctor_cached.cache_clear()
     return db_hospital
 
 @app.delete("/hospitals/{hospital_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_hospital(hospital_id: int, db: Session = Depends(get_db)):
-    db_hospital = db.query(Hospital).filter(Hospital.id == hospital_id).first()
+async def delete_hospital(hospital_id: int, db: AsyncSession = Depends(get_db)):
+    db_hospital = (await db.execute(_GET_HOSPITAL_BY_ID, {"id": hospital_id})).scalar_one_or_none()
     if db_hospital is None:
         raise HTTPException(status_code=404, detail="Hospital not found")
-    db.delete(db_hospital)
-    db.commit()
+    await db.delete(db_hospital)
+    await db.commit()
+    _get_hospital_cached.cache_invalidate(hospital_id)
+    # Roles and doctors embed the hospital name
+    _get_role_cached.cache_clear()
+    _get_doctor_cached.cache_clear()
     return {"message": "Hospital deleted successfully"}
 
 # --- Role Endpoints ---
 @app.post("/roles/", response_model=RoleResponse, status_code=status.HTTP_201_CREATED)
-async def create_role(role: RoleCreate, db: Session = Depends(get_db)):
+async def create_role(role: RoleCreate, db: AsyncSession = Depends(get_db)):
+    hospital_name = None
     if role.hospital_id:
-        hospital = db.query(Hospital).filter(Hospital.id == role.hospital_id).first()
-        if not hospital:
+        hospital_name = (await db.execute(_GET_HOSPITAL_NAME, {"id": role.hospital_id})).scalar_one_or_none()
+        if hospital_name is None:
             raise HTTPException(status_code=404, detail="Hospital not found")
     
-    db_role = Role(**role.dict())
-    db.add(db_role)
-    db.commit()
-    db.refresh(db_role)
+    db_role = (await db.execute(
+        insert(Role).values(**role.model_dump()).returning(Role)
+    )).scalar_one()
+    await db.commit()
     
     # Populate hospital_name for response
-    if db_role.hospital:
-        db_role.hospital_name = db_role.hospital.name
+    db_role.hospital_name = hospital_name
     return db_role
 
 @app.get("/roles/", response_model=List[RoleResponse])
-async def read_roles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    roles = db.query(Role).options(joinedload(Role.hospital)).offset(skip).limit(limit).all()
-    for role in roles:
-        if role.hospital:
-            role.hospital_name = role.hospital.name
-    return roles
-
-@app.get("/roles/{role_id}", response_model=RoleResponse)
-async def read_role(role_id: int, db: Session = Depends(get_db)):
-    role = db.query(Role).options(joinedload(Role.hospital)).filter(Role.id == role_id).first()
+async def read_roles(response: Response, after: Optional[int] = None, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    rows = await _fetch_page(db, _ROLE_ROWS, Role.id, after, limit, response)
+    return [RoleResponse.model_construct(**row) for row in rows]
+
+@alru_cache(maxsize=1024, ttl=5)
+async def _get_role_cached(role_id: int):
+    async with AsyncSessionLocal() as db:
+        role = (await db.execute(_GET_ROLE_WITH_HOSPITAL, {"id": role_id})).scalar_one_or_none()
     if role is None:
         raise HTTPException(status_code=404, detail="Role not found")
     if role.hospital:
         role.hospital_name = role.hospital.name
-    return role
+    return RoleResponse.model_validate(role)
+
+@app.get("/roles/{role_id}", response_model=RoleResponse)
+async def read_role(role_id: int):
+    return await _get_role_cached(role_id)
 
 @app.put("/roles/{role_id}", response_model=RoleResponse)
-async def update_role(role_id: int, role: RoleCreate, db: Session = Depends(get_db)):
-    db_role = db.query(Role).filter(Role.id == role_id).first()
-    if db_role is None:
+async def update_role(role_id: int, role: RoleCreate, db: AsyncSession = Depends(get_db)):
+    # Check the role exists and fetch the hospital name for the response
+    role_found, hospital_name = (await db.execute(select(
+        exists().where(Role.id == role_id),
+        select(Hospital.name).where(Hospital.id == role.hospital_id).scalar_subquery(),
+    ))).one()
+    if not role_found:
         raise HTTPException(status_code=404, detail="Role not found")
     
-    if role.hospital_id:
-        hospital = db.query(Hospital).filter(Hospital.id == role.hospital_id).first()
-        if not hospital:
-            raise HTTPException(status_code=404, detail="Hospital not found")
+    if role.hospital_id and hospital_name is None:
+        raise HTTPException(status_code=404, detail="Hospital not found")
 
-    for key, value in role.dict().items():
-        setattr(db_role, key, value)
-    db.commit()
-    db.refresh(db_role)
+    db_role = (await db.execute(
+        update(Role).where(Role.id == role_id).values(**role.model_dump()).returning(Role)
+    )).scalar_one()
+    await db.commit()
+    _get_role_cached.cache_invalidate(role_id)
+    # Users embed the role name
+    _get_user_cached.cache_clear()
     
-    if db_role.hospital:
-        db_role.hospital_name = db_role.hospital.name
+    db_role.hospital_name = hospital_name
     return db_role
 
 @app.delete("/roles/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_role(role_id: int, db: Session = Depends(get_db)):
-    db_role = db.query(Role).filter(Role.id == role_id).first()
+async def delete_role(role_id: int, db: AsyncSession = Depends(get_db)):
+    db_role = (await db.execute(_GET_ROLE_BY_ID, {"id": role_id})).scalar_one_or_none()
     if db_role is None:
         raise HTTPException(status_code=404, detail="Role not found")
-    db.delete(db_role)
-    db.commit()
+    await db.delete(db_role)
+    await db.commit()
+    _get_role_cached.cache_invalidate(role_id)
+    # Users embed the role name
+    _get_user_cached.cache_clear()
     return {"message": "Role deleted successfully"}
 
 # --- User Endpoints ---
 @app.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user_username = db.query(User).filter(User.username == user.username).first()
-    if db_user_username:
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    # Validate username, email and role (fetching its name) in a single round trip
+    username_taken, email_taken, role_name = (await db.execute(select(
+        exists().where(User.username == user.username),
+        exists().where(User.email == user.email),
+        select(Role.role_name).where(Role.id == user.role_id).scalar_subquery(),
+    ))).one()
+    if username_taken:
         raise HTTPException(status_code=400, detail="Username already registered")
-    db_user_email = db.query(User).filter(User.email == user.email).first()
-    if db_user_email:
+    if email_taken:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    if user.role_id:
-        role = db.query(Role).filter(Role.id == user.role_id).first()
-        if not role:
-            raise HTTPException(status_code=404, detail="Role not found")
-
-    hashed_password = get_password_hash(user.password)
-    db_user = User(
-        username=user.username,
-        full_name=user.full_name,
-        email=user.email,
-        hashed_password=hashed_password,
-        role_id=user.role_id
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    if user.role_id and role_name is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    hashed_password = await get_password_hash(user.password)
+    db_user = (await db.execute(
+        insert(User).values(
+            username=user.username,
+            full_name=user.full_name,
+            email=user.email,
+            hashed_password=hashed_password,
+            role_id=user.role_id
+        ).returning(User)
+    )).scalar_one()
+    await db.commit()
     
-    if db_user.role:
-        db_user.role_name = db_user.role.role_name
+    db_user.role_name = role_name
     return db_user
 
-@app.get("/users/", response_model=List[UserResponse])
-async def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = db.query(User).options(joinedload(User.role)).offset(skip).limit(limit).all()
-    for user in users:
-        if user.role:
-            user.role_name = user.role.role_name
-    return users
+# Each user costs one 46 MiB Argon2 job on the shared hashing pool and two
+# bound variables in the uniqueness lookup, so batches are capped to keep one
+# request from starving POST /users/ or exceeding SQLite's variable limit
+MAX_BULK_USERS = 100
+
+@app.post("/users/bulk", response_model=List[UserResponse], status_code=status.HTTP_201_CREATED)
+async def create_users_bulk(users: List[UserCreate], db: AsyncSession = Depends(get_db)):
+    if not users:
+        return []
+    if len(users) > MAX_BULK_USERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_USERS} users can be created per request")
+
+    usernames = [user.username for user in users]
+    emails = [user.email for user in users]
+    if len(set(usernames)) != len(usernames):
+        raise HTTPException(status_code=400, detail="Duplicate username in request")
+    if len(set(emails)) != len(emails):
+        raise HTTPException(status_code=400, detail="Duplicate email in request")
+
+    existing_users = (await db.execute(
+        select(User.username, User.email).where(or_(User.username.in_(usernames), User.email.in_(emails)))
+    )).all()
+    if any(existing.username in usernames for existing in existing_users):
+        raise HTTPException(status_code=400, detail="Username already registered")
+    if existing_users:
+        raise HTTPException(status_code=400, detail="Email already registered")
 
-@app.get("/users/{user_id}", response_model=UserResponse)
-async def read_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).options(joinedload(User.role)).filter(User.id == user_id).first()
+    # Look up role names once; this also validates every referenced role
+    role_ids = {user.role_id for user in users if user.role_id}
+    role_names = dict((await db.execute(select(Role.id, Role.role_name).where(Role.id.in_(role_ids)))).all()) if role_ids else {}
+    if len(role_names) != len(role_ids):
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    hashed_passwords = await asyncio.gather(*[get_password_hash(user.password) for user in users])
+    rows = [
+        {
+            "username": user.username,
+            "full_name": user.full_name,
+            "email": user.email,
+            "hashed_password": hashed_password,
+            "role_id": user.role_id,
+        }
+        for user, hashed_password in zip(users, hashed_passwords)
+    ]
+    # One executemany INSERT ... RETURNING in a single transaction
+    db_users = (await db.execute(insert(User).returning(User, sort_by_parameter_order=True), rows)).scalars().all()
+    await db.commit()
+
+    for db_user in db_users:
+        db_user.role_name = role_names.get(db_user.role_id)
+    return db_users
+
+@app.get("/users/", response_model=List[UserResponse])
+async def read_users(response: Response, after: Optional[int] = None, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    rows = await _fetch_page(db, _USER_ROWS, User.id, after, limit, response)
+    return [UserResponse.model_construct(**row) for row in rows]
+
+@alru_cache(maxsize=1024, ttl=5)
+async def _get_user_cached(user_id: int):
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(_GET_USER_WITH_ROLE, {"id": user_id})).scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     if user.role:
         user.role_name = user.role.role_name
-    return user
+    return UserResponse.model_validate(user)
+
+@app.get("/users/{user_id}", response_model=UserResponse)
+async def read_user(user_id: int):
+    return await _get_user_cached(user_id)
 
 @app.put("/users/{user_id}", response_model=UserResponse)
-async def update_user(user_id: int, user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if db_user is None:
+async def update_user(user_id: int, user: UserCreate, db: AsyncSession = Depends(get_db)):
+    # Only fields sent in the request are updated, so the response's role is the
+    # requested one if role_id was sent and the user's current one otherwise
+    if "role_id" in user.model_fields_set:
+        role_id = user.role_id
+    else:
+        role_id = select(User.role_id).where(User.id == user_id).scalar_subquery()
+
+    # Check the user exists, username/email aren't taken by another user, and
+    # fetch the role name for the response, all in a single round trip
+    user_found, username_taken, email_taken, role_name = (await db.execute(select(
+        exists().where(User.id == user_id),
+        exists().where(User.username == user.username, User.id != user_id),
+        exists().where(User.email == user.email, User.id != user_id),
+        select(Role.role_name).where(Role.id == role_id).scalar_subquery(),
+    ))).one()
+    if not user_found:
         raise HTTPException(status_code=404, detail="User not found")
+    if username_taken:
+        raise HTTPException(status_code=400, detail="Username already registered")
+    if email_taken:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    if user.role_id and role_name is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+
+    values = user.model_dump(exclude_unset=True, exclude={"password"})
+    if user.password:
+        values["hashed_password"] = await get_password_hash(user.password)
+    db_user = (await db.execute(
+        update(User).where(User.id == user_id).values(**values).returning(User)
+    )).scalar_one()
+    await db.commit()
+    _get_user_cached.cache_invalidate(user_id)
+    # Doctors embed the username and full name
+    _get_doctor_cached.cache_clear()
     
-    # Check for duplicate username/email if they are being changed
-    if user.username != db_user.username:
-        existing_user = db.query(User).filter(User.username == user.username).first()
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Username already registered")
-    if user.email != db_user.email:
-        existing_user = db.query(User).filter(User.email == user.email).first()
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Email already registered")
-
-    if user.role_id:
-        role = db.query(Role).filter(Role.id == user.role_id).first()
-        if not role:
-            raise HTTPException(status_code=404, detail="Role not found")
-
-    for key, value in user.dict(exclude_unset=True).items():
-        if key == "password" and value:
-            setattr(db_user, "hashed_password", get_password_hash(value))
-        elif key != "password":
-            setattr(db_user, key, value)
-    db.commit()
-    db.refresh(db_user)
-    
-    if db_user.role:
-        db_user.role_name = db_user.role.role_name
+    db_user.role_name = role_name
     return db_user
 
 @app.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(user_id: int, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.id == user_id).first()
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    db_user = (await db.execute(_GET_USER_BY_ID, {"id": user_id})).scalar_one_or_none()
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
+    _get_user_cached.cache_invalidate(user_id)
+    # Doctors embed the username and full name
+    _get_doctor_cached.cache_clear()
     return {"message": "User deleted successfully"}
 
 # --- Doctor Endpoints ---
 @app.post("/doctors/", response_model=DoctorResponse, status_code=status.HTTP_201_CREATED)
-async def create_doctor(doctor: DoctorCreate, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == doctor.user_id).first()
-    if not user:
+async def create_doctor(doctor: DoctorCreate, db: AsyncSession = Depends(get_db)):
+    # Validate user, hospital and existing profile (fetching the names shown in
+    # the response) in a single round trip
+    username, full_name, hospital_name, profile_exists = (await db.execute(select(
+        select(User.username).where(User.id == doctor.user_id).scalar_subquery(),
+        select(User.full_name).where(User.id == doctor.user_id).scalar_subquery(),
+        select(Hospital.name).where(Hospital.id == doctor.hospital_id).scalar_subquery(),
+        exists().where(Doctor.user_id == doctor.user_id),
+    ))).one()
+    if username is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    hospital = db.query(Hospital).filter(Hospital.id == doctor.hospital_id).first()
-    if not hospital:
+    if hospital_name is None:
         raise HTTPException(status_code=404, detail="Hospital not found")
     
-    db_doctor = db.query(Doctor).filter(Doctor.user_id == doctor.user_id).first()
-    if db_doctor:
+    if profile_exists:
         raise HTTPException(status_code=400, detail="User already has a doctor profile")
 
-    db_doctor = Doctor(**doctor.dict())
-    db.add(db_doctor)
-    db.commit()
-    db.refresh(db_doctor)
+    db_doctor = (await db.execute(
+        insert(Doctor).values(**doctor.model_dump()).returning(Doctor)
+    )).scalar_one()
+    await db.commit()
     
-    db_doctor.username = db_doctor.user.username
-    db_doctor.full_name = db_doctor.user.full_name
-    db_doctor.hospital_name = db_doctor.hospital.name
+    db_doctor.username = username
+    db_doctor.full_name = full_name
+    db_doctor.hospital_name = hospital_name
     return db_doctor
 
 @app.get("/doctors/", response_model=List[DoctorResponse])
-async def read_doctors(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    doctors = db.query(Doctor).options(joinedload(Doctor.user), joinedload(Doctor.hospital)).offset(skip).limit(limit).all()
-    for doctor in doctors:
-        doctor.username = doctor.user.username
-        doctor.full_name = doctor.user.full_name
-        doctor.hospital_name = doctor.hospital.name
-    return doctors
-
-@app.get("/doctors/{doctor_id}", response_model=DoctorResponse)
-async def read_doctor(doctor_id: int, db: Session = Depends(get_db)):
-    doctor = db.query(Doctor).options(joinedload(Doctor.user), joinedload(Doctor.hospital)).filter(Doctor.id == doctor_id).first()
+async def read_doctors(response: Response, after: Optional[int] = None, limit: int = 100, db: AsyncSession = Depends(get_db)):
+    rows = await _fetch_page(db, _DOCTOR_ROWS, Doctor.id, after, limit, response)
+    return [DoctorResponse.model_construct(**row) for row in rows]
+
+@alru_cache(maxsize=1024, ttl=5)
+async def _get_doctor_cached(doctor_id: int):
+    async with AsyncSessionLocal() as db:
+        doctor = (await db.execute(_GET_DOCTOR_WITH_RELATIONS, {"id": doctor_id})).scalar_one_or_none()
     if doctor is None:
         raise HTTPException(status_code=404, detail="Doctor not found")
     doctor.username = doctor.user.username
     doctor.full_name = doctor.user.full_name
     doctor.hospital_name = doctor.hospital.name
-    return doctor
+    return DoctorResponse.model_validate(doctor)
+
+@app.get("/doctors/{doctor_id}", response_model=DoctorResponse)
+async def read_doctor(doctor_id: int):
+    return await _get_doctor_cached(doctor_id)
 
 @app.put("/doctors/{doctor_id}", response_model=DoctorResponse)
-async def update_doctor(doctor_id: int, doctor: DoctorCreate, db: Session = Depends(get_db)):
-    db_doctor = db.query(Doctor).filter(Doctor.id == doctor_id).first()
-    if db_doctor is None:
+async def update_doctor(doctor_id: int, doctor: DoctorCreate, db: AsyncSession = Depends(get_db)):
+    # Check the doctor exists and fetch the user/hospital fields for the response
+    doctor_found, username, full_name, hospital_name = (await db.execute(select(
+        exists().where(Doctor.id == doctor_id),
+        select(User.username).where(User.id == doctor.user_id).scalar_subquery(),
+        select(User.full_name).where(User.id == doctor.user_id).scalar_subquery(),
+        select(Hospital.name).where(Hospital.id == doctor.hospital_id).scalar_subquery(),
+    ))).one()
+    if not doctor_found:
         raise HTTPException(status_code=404, detail="Doctor not found")
     
-    user = db.query(User).filter(User.id == doctor.user_id).first()
-    if not user:
+    if username is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    hospital = db.query(Hospital).filter(Hospital.id == doctor.hospital_id).first()
-    if not hospital:
+    if hospital_name is None:
         raise HTTPException(status_code=404, detail="Hospital not found")
 
-    for key, value in doctor.dict().items():
-        setattr(db_doctor, key, value)
-    db.commit()
-    db.refresh(db_doctor)
+    db_doctor = (await db.execute(
+        update(Doctor).where(Doctor.id == doctor_id).values(**doctor.model_dump()).returning(Doctor)
+    )).scalar_one()
+    await db.commit()
+    _get_doctor_cached.cache_invalidate(doctor_id)
     
-    db_doctor.username = db_doctor.user.username
-    db_doctor.full_name = db_doctor.user.full_name
-    db_doctor.hospital_name = db_doctor.hospital.name
+    db_doctor.username = username
+    db_doctor.full_name = full_name
+    db_doctor.hospital_name = hospital_name
     return db_doctor
 
 @app.delete("/doctors/{doctor_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_doctor(doctor_id: int, db: Session = Depends(get_db)):
-    db_doctor = db.query(Doctor).filter(Doctor.id == doctor_id).first()
+async def delete_doctor(doctor_id: int, db: AsyncSession = Depends(get_db)):
+    db_doctor = (await db.execute(_GET_DOCTOR_BY_ID, {"id": doctor_id})).scalar_one_or_none()
     if db_doctor is None:
         raise HTTPException(status_code=404, detail="Doctor not found")
-    db.delete(db_doctor)
-    db.commit()
+    await db.delete(db_doctor)
+    await db.commit()
+    _get_doctor_cached.cache_invalidate(doctor_id)
     return {"message": "Doctor deleted successfully"}
@@ -0,0 +1,61 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# Point the app at a throwaway database before it is imported
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import main  # noqa: E402
+from database import engine  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One app lifespan for the whole session, so tables are created once
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def seed(client):
+    hospital = client.post("/hospitals/", json={"name": "General", "address": "1 Main St"}).json()
+    role = client.post("/roles/", json={"role_name": "Doctor", "permissions": "read", "hospital_id": hospital["id"]}).json()
+    users = client.post("/users/bulk", json=[
+        {"username": f"user{i}", "full_name": f"User {i}", "email": f"user{i}@example.com", "password": "secret", "role_id": role["id"]}
+        for i in range(10)
+    ]).json()
+    doctors = [
+        client.post("/doctors/", json={"user_id": user["id"], "hospital_id": hospital["id"], "specialty": "General"}).json()
+        for user in users
+    ]
+    return {"hospital": hospital, "role": role, "users": users, "doctors": doctors}
+
+
+@pytest.fixture
+def count_queries():
+    """Collect every SQL statement sent through the engine inside the block."""
+    @contextmanager
+    def _count_queries():
+        queries = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _record)
+        try:
+            yield queries
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+    return _count_queries
+
+
+@pytest.fixture
+def clear_caches():
+    for cached in (main._get_hospital_cached, main._get_role_cached, main._get_user_cached, main._get_doctor_cached):
+        cached.cache_clear()
@@ -0,0 +1,64 @@
+import itertools
+
+import pytest
+
+_suffix = itertools.count()
+
+
+@pytest.fixture
+def records(client):
+    n = next(_suffix)
+    hospital = client.post("/hospitals/", json={"name": f"Cache Hospital {n}", "address": "3 Cache St"}).json()
+    role = client.post("/roles/", json={"role_name": "Cache Role", "permissions": "read", "hospital_id": hospital["id"]}).json()
+    user = client.post("/users/", json={
+        "username": f"cacheuser{n}", "full_name": "Cache User", "email": f"cacheuser{n}@example.com", "password": "secret", "role_id": role["id"],
+    }).json()
+    doctor = client.post("/doctors/", json={"user_id": user["id"], "hospital_id": hospital["id"], "specialty": "General"}).json()
+    return {"hospital": hospital, "role": role, "user": user, "doctor": doctor}
+
+
+def test_hospital_update_refreshes_cached_roles_and_doctors(client, records):
+    hospital, role, doctor = records["hospital"], records["role"], records["doctor"]
+    # Warm the caches
+    assert client.get(f"/roles/{role['id']}").json()["hospital_name"] == hospital["name"]
+    assert client.get(f"/doctors/{doctor['id']}").json()["hospital_name"] == hospital["name"]
+
+    new_name = hospital["name"] + " (renamed)"
+    response = client.put(f"/hospitals/{hospital['id']}", json={"name": new_name, "address": "3 Cache St"})
+    assert response.status_code == 200
+
+    assert client.get(f"/hospitals/{hospital['id']}").json()["name"] == new_name
+    assert client.get(f"/roles/{role['id']}").json()["hospital_name"] == new_name
+    assert client.get(f"/doctors/{doctor['id']}").json()["hospital_name"] == new_name
+
+
+def test_role_update_refreshes_cached_users(client, records):
+    role, user = records["role"], records["user"]
+    assert client.get(f"/users/{user['id']}").json()["role_name"] == "Cache Role"
+
+    client.put(f"/roles/{role['id']}", json={"role_name": "Renamed Role", "permissions": "read", "hospital_id": role["hospital_id"]})
+
+    assert client.get(f"/roles/{role['id']}").json()["role_name"] == "Renamed Role"
+    assert client.get(f"/users/{user['id']}").json()["role_name"] == "Renamed Role"
+
+
+def test_user_update_refreshes_cached_doctors(client, records):
+    user, doctor = records["user"], records["doctor"]
+    assert client.get(f"/doctors/{doctor['id']}").json()["full_name"] == "Cache User"
+
+    client.put(f"/users/{user['id']}", json={
+        "username": user["username"] + "x", "full_name": "Renamed User", "email": user["email"], "password": "secret",
+    })
+
+    body = client.get(f"/doctors/{doctor['id']}").json()
+    assert body["username"] == user["username"] + "x"
+    assert body["full_name"] == "Renamed User"
+
+
+def test_delete_evicts_cached_doctor(client, records):
+    doctor = records["doctor"]
+    assert client.get(f"/doctors/{doctor['id']}").status_code == 200
+
+    assert client.delete(f"/doctors/{doctor['id']}").status_code == 204
+
+    assert client.get(f"/doctors/{doctor['id']}").status_code == 404
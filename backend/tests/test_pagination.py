@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/hospitals/", "/roles/", "/users/", "/doctors/"])
+def test_keyset_pagination_walks_two_pages(client, seed, path):
+    all_ids = [row["id"] for row in client.get(path, params={"limit": 500}).json()]
+    assert all_ids == sorted(all_ids)
+    if len(all_ids) < 2:
+        pytest.skip("needs at least two rows")
+    # A full first page followed by a shorter last page
+    limit = len(all_ids) // 2 + 1
+
+    first = client.get(path, params={"limit": limit})
+    first_ids = [row["id"] for row in first.json()]
+    assert first_ids == all_ids[:limit]
+    assert first.headers["X-Next-Cursor"] == str(first_ids[-1])
+
+    second = client.get(path, params={"limit": limit, "after": first.headers["X-Next-Cursor"]})
+    second_ids = [row["id"] for row in second.json()]
+    assert second_ids == all_ids[limit:]
+    assert len(second_ids) < limit
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_after_last_id_returns_empty_page(client, seed):
+    last_id = client.get("/hospitals/", params={"limit": 500}).json()[-1]["id"]
+    response = client.get("/hospitals/", params={"after": last_id})
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
@@ -0,0 +1,34 @@
+import asyncio
+import os
+
+import bcrypt
+import pytest
+
+import main
+
+
+def test_new_hashes_use_argon2id():
+    hashed = main.pwd_context.hash("secret")
+    assert hashed.startswith("$argon2id$")
+    assert main.pwd_context.verify("secret", hashed)
+    assert not main.pwd_context.needs_update(hashed)
+
+
+def test_legacy_bcrypt_hash_verifies_and_needs_update():
+    legacy = bcrypt.hashpw(b"secret", bcrypt.gensalt()).decode()
+    assert main.pwd_context.verify("secret", legacy)
+    assert not main.pwd_context.verify("wrong", legacy)
+    assert main.pwd_context.needs_update(legacy)
+
+
+def test_get_password_hash_requires_running_pool(monkeypatch):
+    monkeypatch.setattr(main, "executor", None)
+    with pytest.raises(RuntimeError):
+        asyncio.run(main.get_password_hash("secret"))
+
+
+def test_get_password_hash_runs_in_worker_process(client):
+    hashed = client.portal.call(main.get_password_hash, "secret")
+    assert main.pwd_context.verify("secret", hashed)
+    # The pool's workers are separate processes, not threads of this one
+    assert main.executor.submit(os.getpid).result() != os.getpid()
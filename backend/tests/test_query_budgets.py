@@ -0,0 +1,74 @@
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/hospitals/", "/roles/", "/users/", "/doctors/"])
+def test_list_endpoints_use_one_query(client, seed, count_queries, path):
+    with count_queries() as single_row:
+        client.get(path, params={"limit": 1})
+    with count_queries() as queries:
+        response = client.get(path, params={"limit": 500})
+    assert response.status_code == 200
+    assert response.json()
+    assert len(queries) <= 1, queries
+    # No per-row lazy loads: the statement count is the same for 1 row or 500
+    assert len(queries) == len(single_row)
+
+
+@pytest.mark.parametrize("kind", ["hospital", "role", "user", "doctor"])
+def test_point_reads_use_one_query(client, seed, count_queries, clear_caches, kind):
+    obj = seed[kind] if kind in ("hospital", "role") else seed[kind + "s"][0]
+    with count_queries() as queries:
+        response = client.get(f"/{kind}s/{obj['id']}")
+    assert response.status_code == 200
+    assert len(queries) <= 1, queries
+
+
+def test_point_reads_are_cached(client, seed, count_queries, clear_caches):
+    doctor_id = seed["doctors"][0]["id"]
+    client.get(f"/doctors/{doctor_id}")
+    with count_queries() as queries:
+        response = client.get(f"/doctors/{doctor_id}")
+    assert response.json()["hospital_name"] == "General"
+    assert queries == []
+
+
+def test_delete_doctor_query_budget(client, seed, count_queries):
+    doctor_id = seed["doctors"][-1]["id"]
+    with count_queries() as queries:
+        response = client.delete(f"/doctors/{doctor_id}")
+    assert response.status_code == 204
+    # Look up the row, then delete it
+    assert len(queries) <= 2, queries
+    assert client.get(f"/doctors/{doctor_id}").status_code == 404
+
+
+def _hospital_with_children(client, name):
+    hospital = client.post("/hospitals/", json={"name": name, "address": "2 Side St"}).json()
+    role = client.post("/roles/", json={"role_name": name, "permissions": "read", "hospital_id": hospital["id"]}).json()
+    user = client.post("/users/", json={
+        "username": name, "full_name": name, "email": f"{name}@example.com", "password": "secret", "role_id": role["id"],
+    }).json()
+    client.post("/doctors/", json={"user_id": user["id"], "hospital_id": hospital["id"], "specialty": "General"})
+    return hospital, role, user
+
+
+def test_delete_hospital_query_budget(client, count_queries):
+    hospital, _, _ = _hospital_with_children(client, "delete-hospital")
+    with count_queries() as queries:
+        response = client.delete(f"/hospitals/{hospital['id']}")
+    assert response.status_code == 204
+    # Look up the row, load roles and doctors to detach them, update each
+    # child table, then delete the hospital; nothing else is loaded
+    assert len(queries) <= 6, queries
+    assert not any(" FROM users" in query for query in queries), queries
+
+
+def test_delete_user_query_budget(client, count_queries):
+    _, _, user = _hospital_with_children(client, "delete-user")
+    with count_queries() as queries:
+        response = client.delete(f"/users/{user['id']}")
+    assert response.status_code == 204
+    # Look up the row, load its doctor profile to detach it, update it, then
+    # delete the user; no hospitals or roles are loaded
+    assert len(queries) <= 4, queries
+    assert not any(" FROM hospitals" in query or " FROM roles" in query for query in queries), queries
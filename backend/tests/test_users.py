@@ -0,0 +1,30 @@
+def _create_user(client, role_id, name):
+    response = client.post("/users/", json={
+        "username": name, "full_name": name.title(), "email": f"{name}@example.com", "password": "secret", "role_id": role_id,
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_update_user_without_role_id_keeps_role(client, seed):
+    role = seed["role"]
+    user = _create_user(client, role["id"], "keeprole")
+    response = client.put(f"/users/{user['id']}", json={
+        "username": "keeprole", "full_name": "Renamed", "email": "keeprole@example.com", "password": "secret",
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["full_name"] == "Renamed"
+    assert body["role_id"] == role["id"]
+    assert body["role_name"] == role["role_name"]
+    assert client.get(f"/users/{user['id']}").json()["role_id"] == role["id"]
+
+
+def test_update_user_with_null_role_id_clears_role(client, seed):
+    user = _create_user(client, seed["role"]["id"], "droprole")
+    response = client.put(f"/users/{user['id']}", json={
+        "username": "droprole", "full_name": "Droprole", "email": "droprole@example.com", "password": "secret", "role_id": None,
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["role_id"] is None
+    assert response.json()["role_name"] is None
@@ -0,0 +1,78 @@
+import itertools
+
+import pytest
+
+import main
+
+_suffix = itertools.count()
+
+
+def _user(name, **overrides):
+    user = {"username": name, "full_name": name.title(), "email": f"{name}@example.com", "password": "secret"}
+    user.update(overrides)
+    return user
+
+
+@pytest.fixture
+def names():
+    n = next(_suffix)
+    return [f"bulk{n}_{i}" for i in range(3)]
+
+
+def test_bulk_create_returns_users_in_order(client, seed, names):
+    role = seed["role"]
+    response = client.post("/users/bulk", json=[_user(name, role_id=role["id"]) for name in names[:2]] + [_user(names[2])])
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert [user["username"] for user in body] == names
+    assert [user["role_name"] for user in body] == [role["role_name"], role["role_name"], None]
+    assert client.get(f"/users/{body[0]['id']}").json()["username"] == names[0]
+
+
+def test_bulk_create_empty_list(client):
+    response = client.post("/users/bulk", json=[])
+    assert response.status_code == 201
+    assert response.json() == []
+
+
+@pytest.mark.parametrize("field, detail", [
+    ("username", "Duplicate username in request"),
+    ("email", "Duplicate email in request"),
+])
+def test_bulk_create_rejects_duplicates_in_request(client, names, field, detail):
+    first, second = _user(names[0]), _user(names[1])
+    second[field] = first[field]
+    response = client.post("/users/bulk", json=[first, second])
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+@pytest.mark.parametrize("field, detail", [
+    ("username", "Username already registered"),
+    ("email", "Email already registered"),
+])
+def test_bulk_create_rejects_existing_users(client, seed, names, field, detail):
+    existing = seed["users"][0]
+    new = _user(names[0])
+    new[field] = existing[field]
+    response = client.post("/users/bulk", json=[_user(names[1]), new])
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+    # Nothing from the rejected batch was inserted
+    usernames = {user["username"] for user in client.get("/users/", params={"limit": 500}).json()}
+    assert names[1] not in usernames
+
+
+def test_bulk_create_rejects_unknown_role(client, seed, names):
+    response = client.post("/users/bulk", json=[_user(names[0], role_id=seed["role"]["id"]), _user(names[1], role_id=999999)])
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Role not found"
+
+
+def test_bulk_create_rejects_oversized_batch(client, count_queries):
+    users = [_user(f"toomany{i}") for i in range(main.MAX_BULK_USERS + 1)]
+    with count_queries() as queries:
+        response = client.post("/users/bulk", json=users)
+    assert response.status_code == 400
+    # Rejected before touching the database or the hashing pool
+    assert queries == []